@@ -1,4 +1,5 @@
 # !pip install mediapipe opencv-python pandas scikit-learn
+import argparse
 import csv
 import os
 import numpy as np
@@ -7,7 +8,444 @@ import mediapipe as mp
 from datetime import datetime
 import json
 import pandas as pd
+import queue
+import threading
+import time
 from collections import defaultdict
+from math import ceil, sqrt
+from incremental_trainer import HotSwapModel
+from feature_schema import CLASSES, KEY_FACE_LANDMARKS, get_schema
+from session_scheduler import AdaptiveSessionScheduler
+
+
+class SessionRecorder:
+    """Encode raw camera frames to a video file on a background thread"""
+
+    INDEX_HEADER = ['capture_frame', 'video_frame', 'capture_time', 'csv_row']
+
+    def __init__(self, output_dir, class_name, user_id, session_type, csv_filename,
+                 fps=30.0, codec='mp4v', queue_size=120):
+        os.makedirs(output_dir, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        base_name = f"{user_id}_{class_name.lower()}_{stamp}"
+        self.video_path = os.path.join(output_dir, f"{base_name}.mp4")
+        self.index_path = os.path.join(output_dir, f"{base_name}_frames.csv")
+        self.meta_path = os.path.join(output_dir, f"{base_name}.json")
+
+        self.class_name = class_name
+        self.user_id = user_id
+        self.session_type = session_type
+        self.csv_filename = csv_filename
+        self.fps = fps
+        self.codec = codec
+
+        # Bounded queue: when the encoder falls behind, frames are dropped
+        # instead of blocking the capture loop
+        self.frame_queue = queue.Queue(maxsize=queue_size)
+        self.dropped = []
+        self.captured_frames = 0
+        self.encoded_frames = 0
+        self.dropped_frames = 0
+        self.unwritten_frames = 0  # Encoder thread only: frames lost to an unusable writer
+        self.first_capture_time = None
+        self.last_capture_time = None
+        self.writer = None
+        self.writer_failed = False
+        self.metadata = {}
+        self.worker = threading.Thread(target=self._encode_loop, daemon=True)
+
+    def start(self):
+        """Write session metadata and start the encoder thread"""
+        self.metadata = {
+            'class': self.class_name,
+            'user_id': self.user_id,
+            'session_type': self.session_type,
+            'csv_file': self.csv_filename,
+            'video_file': os.path.basename(self.video_path),
+            'index_file': os.path.basename(self.index_path),
+            # Frames arrive at Holistic speed, not the camera rate, so the
+            # container timeline is nominal only
+            'container_fps': self.fps,
+            'measured_fps': None,
+            'timing_source': 'capture_time column of the index file',
+            'codec': self.codec,
+            'started': datetime.now().isoformat(),
+        }
+        self.write_metadata()
+
+        self.worker.start()
+        print(f"Recording raw video to: {self.video_path}")
+
+    def write_metadata(self):
+        with open(self.meta_path, 'w') as f:
+            json.dump(self.metadata, f, indent=2)
+
+    def submit(self, frame, capture_time, csv_row=None):
+        """Queue a frame for encoding without blocking; returns False if dropped"""
+        capture_frame = self.captured_frames
+        self.captured_frames += 1
+        if self.first_capture_time is None:
+            self.first_capture_time = capture_time
+        self.last_capture_time = capture_time
+        try:
+            self.frame_queue.put_nowait((capture_frame, capture_time, csv_row, frame))
+            return True
+        except queue.Full:
+            # Keep the frame in the index so row alignment stays frame-accurate
+            self.dropped.append((capture_frame, capture_time, csv_row))
+            self.dropped_frames += 1
+            return False
+
+    def _encode_loop(self):
+        """Encoder thread: write frames to video and the frame index"""
+        index_rows = []
+        while True:
+            item = self.frame_queue.get()
+            if item is None:
+                break
+
+            capture_frame, capture_time, csv_row, frame = item
+            if self.writer is None and not self.writer_failed:
+                height, width = frame.shape[:2]
+                fourcc = cv2.VideoWriter_fourcc(*self.codec)
+                self.writer = cv2.VideoWriter(self.video_path, fourcc, self.fps, (width, height))
+                if not self.writer.isOpened():
+                    print(f"ERROR: Could not open video writer ({self.codec}) for {self.video_path}")
+                    self.writer = None
+                    self.writer_failed = True
+
+            if self.writer_failed:
+                # Nothing reaches the file, so account for the frame as dropped
+                self.dropped.append((capture_frame, capture_time, csv_row))
+                self.unwritten_frames += 1
+                continue
+
+            self.writer.write(frame)
+            index_rows.append([capture_frame, self.encoded_frames, f"{capture_time:.6f}",
+                               '' if csv_row is None else csv_row])
+            self.encoded_frames += 1
+
+        # Dropped frames have no video frame but keep their capture slot
+        for capture_frame, capture_time, csv_row in self.dropped:
+            index_rows.append([capture_frame, '', f"{capture_time:.6f}",
+                               '' if csv_row is None else csv_row])
+
+        # Written in capture order so consumers can join on capture_frame/csv_row directly
+        index_rows.sort(key=lambda index_row: index_row[0])
+        with open(self.index_path, mode='w', newline='') as f:
+            index_writer = csv.writer(f)
+            index_writer.writerow(self.INDEX_HEADER)
+            index_writer.writerows(index_rows)
+
+        if self.writer is not None:
+            self.writer.release()
+
+    def close(self):
+        """Flush pending frames, stop the encoder and report drops"""
+        self.frame_queue.put(None)
+        self.worker.join()
+
+        total_dropped = self.dropped_frames + self.unwritten_frames
+        duration = (self.last_capture_time or 0) - (self.first_capture_time or 0)
+        if duration > 0:
+            self.metadata['measured_fps'] = round((self.captured_frames - 1) / duration, 2)
+        self.metadata['frames_captured'] = self.captured_frames
+        self.metadata['frames_encoded'] = self.encoded_frames
+        self.metadata['frames_dropped'] = total_dropped
+        self.metadata['writer_failed'] = self.writer_failed
+        self.write_metadata()
+
+        print(f"\nRECORDING SUMMARY:")
+        print(f"   Video file: {self.video_path}")
+        print(f"   Frames captured: {self.captured_frames}")
+        print(f"   Frames encoded: {self.encoded_frames}")
+        print(f"   Frames dropped by encoder: {total_dropped}")
+        if self.writer_failed:
+            print(f"   WARNING: video writer could not be opened - no video was recorded")
+        if total_dropped:
+            print(f"   Dropped frames are listed in {self.index_path} with no video_frame")
+
+
+class StreamScheduler:
+    """Share inference capacity fairly between concurrent camera streams"""
+
+    def __init__(self, max_concurrent=None, max_lead=5):
+        if max_concurrent is None:
+            # Holistic already uses several threads per call, so leave headroom
+            max_concurrent = max(1, (os.cpu_count() or 2) // 2)
+        self.max_concurrent = max_concurrent
+        self.max_lead = max_lead
+        self.active = 0
+        self.waiting = 0
+        self.processed = {}
+        self.condition = threading.Condition()
+
+    def register(self, stream_id):
+        """Add a stream level with the slowest active stream"""
+        with self.condition:
+            self.processed[stream_id] = min(self.processed.values(), default=0)
+
+    def unregister(self, stream_id):
+        """Remove a finished stream so it no longer holds others back"""
+        with self.condition:
+            self.processed.pop(stream_id, None)
+            self.condition.notify_all()
+
+    def _can_run(self, stream_id):
+        free_slots = self.max_concurrent - self.active
+        if free_slots <= 0:
+            return False
+        # Uncontended: every waiting stream gets a slot, so fast cameras keep their rate
+        if self.waiting <= free_slots:
+            return True
+        # Contended: a stream too far ahead of the slowest one yields its turn
+        return self.processed[stream_id] - min(self.processed.values()) <= self.max_lead
+
+    def acquire(self, stream_id, timeout=0.5):
+        """Wait for an inference slot; returns False if none became free"""
+        with self.condition:
+            self.waiting += 1
+            try:
+                granted = self.condition.wait_for(lambda: self._can_run(stream_id), timeout)
+            finally:
+                self.waiting -= 1
+            if granted:
+                self.active += 1
+            return granted
+
+    def release(self, stream_id):
+        """Return an inference slot after processing one frame"""
+        with self.condition:
+            self.active -= 1
+            self.processed[stream_id] += 1
+            self.condition.notify_all()
+
+
+class CameraStream:
+    """One camera bound to one participant and their class plan"""
+
+    def __init__(self, collector, stream_id, camera_index, user_id, class_plan, session_type,
+                 scheduler, file_locks, stop_event, quality_threshold=50):
+        self.collector = collector
+        self.stream_id = stream_id
+        self.camera_index = camera_index
+        self.user_id = user_id
+        self.class_plan = class_plan
+        self.session_type = session_type
+        self.scheduler = scheduler
+        self.file_locks = file_locks
+        self.stop_event = stop_event
+        self.quality_threshold = quality_threshold
+
+        self.plan_position = 0
+        self.preview_mode = True
+        self.collecting = False
+        self.finished = False
+        # Key presses from the UI thread; applied by the worker between frames
+        self.commands = queue.Queue()
+        self.good_quality_count = 0
+        self.frame_count = 0
+        self.low_quality_count = 0
+        self.skipped_frames = 0
+        self.collected = defaultdict(int)
+
+        self.latest_frame = None
+        self.frame_lock = threading.Lock()
+        self.row_queue = queue.Queue()
+        self.worker = threading.Thread(target=self._inference_loop, daemon=True)
+        self.writer = threading.Thread(target=self._writer_loop, daemon=True)
+
+    @property
+    def label(self):
+        return f"Camera {self.camera_index} ({self.user_id})"
+
+    def current_target(self):
+        return self.class_plan[self.plan_position]
+
+    def start(self):
+        self.scheduler.register(self.stream_id)
+        self.writer.start()
+        self.worker.start()
+
+    def join(self):
+        self.worker.join()
+        self.writer.join()
+
+    def send_command(self, command):
+        """Queue 'start', 'pause' or 'skip' for the class shown when the key was pressed"""
+        if not self.finished:
+            self.commands.put((command, self.plan_position))
+
+    def start_collecting(self):
+        """SPACEBAR: leave preview mode for the current class"""
+        self.send_command('start')
+
+    def toggle_pause(self):
+        self.send_command('pause')
+
+    def skip_class(self):
+        self.send_command('skip')
+
+    def _apply_commands(self):
+        """Worker thread: apply queued key presses; state is only changed here"""
+        while not self.finished:
+            try:
+                command, plan_position = self.commands.get_nowait()
+            except queue.Empty:
+                return
+            # A key meant for a class that has since finished must not act on the next one
+            if plan_position != self.plan_position:
+                continue
+
+            if command == 'start' and self.preview_mode:
+                self.preview_mode = False
+                self.collecting = True
+                print(f"{self.label}: COLLECTION STARTED for {self.current_target()[0]}")
+            elif command == 'pause' and not self.preview_mode:
+                self.collecting = not self.collecting
+                print(f"{self.label}: collection {'resumed' if self.collecting else 'paused'}")
+            elif command == 'skip':
+                self._advance_class()
+
+    def get_preview_frame(self, size, selected=False):
+        """Latest annotated frame, or a placeholder while unavailable"""
+        with self.frame_lock:
+            frame = self.latest_frame
+        if frame is None or self.finished:
+            frame = np.zeros((size[1], size[0], 3), dtype=np.uint8)
+            message = "FINISHED" if self.finished else "WAITING FOR CAMERA"
+            cv2.putText(frame, f"{self.label}: {message}", (10, 30),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 165, 255), 1)
+        else:
+            frame = cv2.resize(frame, size)
+
+        # Key hint for per-stream control; the selected stream gets a border
+        cv2.putText(frame, f"KEY {self.stream_id + 1}{' (SELECTED)' if selected else ''}", (10, size[1] - 12),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 255), 1)
+        if selected:
+            cv2.rectangle(frame, (0, 0), (size[0] - 1, size[1] - 1), (0, 255, 255), 3)
+        return frame
+
+    def _advance_class(self):
+        """Move to the next class in the plan, back in preview mode"""
+        class_name, target_samples = self.current_target()
+        self.collected[class_name] += self.good_quality_count
+        print(f"{self.label}: {class_name} done with {self.good_quality_count}/{target_samples} samples")
+
+        self.plan_position += 1
+        self.good_quality_count = 0
+        self.preview_mode = True
+        self.collecting = False
+
+        if self.plan_position >= len(self.class_plan):
+            self.finished = True
+            print(f"{self.label}: class plan complete")
+        else:
+            next_class, next_target = self.current_target()
+            print(f"{self.label}: NEXT CLASS {next_class} ({next_target} samples) - press SPACEBAR when ready")
+
+    def _inference_loop(self):
+        """Worker thread: capture, run Holistic and queue accepted rows"""
+        cap = cv2.VideoCapture(self.camera_index)
+        if not cap.isOpened():
+            print(f"ERROR: Could not open camera {self.camera_index} for {self.user_id}!")
+            self.finished = True
+        else:
+            # Keep the driver buffer short so reads return the newest frame (backend permitting)
+            cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
+        try:
+            with self.collector.mp_holistic.Holistic(
+                min_detection_confidence=0.3,
+                min_tracking_confidence=0.3
+            ) as holistic:
+
+                while not self.finished and not self.stop_event.is_set():
+                    self._apply_commands()
+                    if self.finished:
+                        break
+
+                    # Wait for a slot first so the frame processed is the newest one
+                    if not self.scheduler.acquire(self.stream_id):
+                        # No slot: discard a buffered frame so it cannot go stale
+                        cap.grab()
+                        self.skipped_frames += 1
+                        continue
+                    try:
+                        ret, frame = cap.read()
+                        if not ret:
+                            print(f"ERROR: Could not read frame from camera {self.camera_index}!")
+                            break
+                        capture_time = time.time()
+
+                        image = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+                        image.flags.writeable = False
+                        results = holistic.process(image)
+                    finally:
+                        self.scheduler.release(self.stream_id)
+
+                    self.frame_count += 1
+                    class_name, target_samples = self.current_target()
+                    quality_score, quality_details = self.collector.calculate_quality_score(results)
+                    self.collector.draw_landmarks(frame, results)
+
+                    if not self.preview_mode and self.collecting and quality_score >= self.quality_threshold:
+                        timestamp = datetime.fromtimestamp(capture_time).strftime("%Y-%m-%d %H:%M:%S")
+                        row = self.collector.build_sample_row(class_name, timestamp, self.user_id,
+                                                              self.session_type, quality_score, results)
+                        self.row_queue.put((f"{class_name.lower()}_data.csv", row))
+                        self.good_quality_count += 1
+                    elif not self.preview_mode and self.collecting:
+                        self.low_quality_count += 1
+
+                    if self.preview_mode:
+                        mode_line = f"PREVIEW - {class_name} | Press SPACEBAR to START"
+                        color = (0, 128, 60)
+                    else:
+                        progress = (self.good_quality_count / target_samples) * 100
+                        mode_line = (f"{'COLLECTING' if self.collecting else 'PAUSED'} - {class_name} | "
+                                     f"{self.good_quality_count}/{target_samples} ({progress:.1f}%)")
+                        color = (0, 255, 0) if self.collecting and quality_score >= self.quality_threshold else (0, 165, 255)
+                    status_lines = [
+                        f"{self.label}",
+                        mode_line,
+                        f"Quality: {quality_score:.0f}% (need >={self.quality_threshold}%)",
+                        f"Pose:{quality_details['pose']} Face:{quality_details['face']} L.Hand:{quality_details['left_hand']} R.Hand:{quality_details['right_hand']}"
+                    ]
+                    for i, line in enumerate(status_lines):
+                        cv2.putText(frame, line, (10, 25 + (i * 22)), cv2.FONT_HERSHEY_SIMPLEX, 0.45, color, 1)
+
+                    with self.frame_lock:
+                        self.latest_frame = frame
+
+                    if self.good_quality_count >= target_samples:
+                        print(f"{self.label}: TARGET REACHED for {class_name}")
+                        self._advance_class()
+        finally:
+            if not self.finished and self.plan_position < len(self.class_plan):
+                self.collected[self.current_target()[0]] += self.good_quality_count
+            self.finished = True
+            cap.release()
+            self.scheduler.unregister(self.stream_id)
+            self.row_queue.put(None)
+
+    def _writer_loop(self):
+        """Writer thread: append queued rows to the class CSV files"""
+        while True:
+            item = self.row_queue.get()
+            if item is None:
+                break
+
+            csv_filename, row = item
+            try:
+                # Several participants may be collecting the same class
+                with self.file_locks[csv_filename]:
+                    with open(csv_filename, mode='a', newline='') as f:
+                        csv_writer = csv.writer(f, delimiter=',', quotechar='"', quoting=csv.QUOTE_MINIMAL)
+                        csv_writer.writerow(row)
+            except Exception as e:
+                print(f"Error saving data for {self.label}: {e}")
+
 
 class InterviewPostureCollector:
     def __init__(self):
@@ -17,11 +455,7 @@ class InterviewPostureCollector:
         self.mp_hands = mp.solutions.hands
         
         # Essential classes for interview analysis
-        self.classes = [
-            "Good_Posture", "Slouching", "Forward_Head", "Shoulders_Hunched",
-            "Leaning_Forward", "Leaning_Back", "Confident_Expression", 
-            "Nervous_Expression", "Head_Down", "Fidgeting_Hands"
-        ]
+        self.classes = list(CLASSES)
         
         # CORRECTED: Face landmark indices based on research
         self.LEFT_EYE_LANDMARKS = [463, 398, 384, 385, 386, 387, 388, 466, 263, 249, 390, 373, 374, 380, 381, 382, 362]
@@ -31,50 +465,18 @@ class InterviewPostureCollector:
         self.NOSE_LANDMARKS = [193, 168, 417, 122, 351, 196, 419, 3, 248, 236, 456, 198, 420, 131, 360, 49, 279, 48, 278, 219, 439, 59, 289, 218, 438, 237, 457, 44, 19, 274]
         self.MOUTH_LANDMARKS = [0, 267, 269, 270, 409, 306, 375, 321, 405, 314, 17, 84, 181, 91, 146, 61, 185, 40, 39, 37]
         
-        # Optimized key landmarks for interview analysis
-        self.key_face_landmarks = {
-            # Eyes (for gaze direction and confidence)
-            'left_eye_inner': 362,      
-            'left_eye_outer': 263,       
-            'right_eye_inner': 133,     
-            'right_eye_outer': 33,      
-            'left_eye_center': 385,     
-            'right_eye_center': 160,    
-            
-            # Iris (for precise gaze tracking)
-            'left_iris_center': 474,    
-            'right_iris_center': 469,   
-            
-            # Nose (for head orientation)
-            'nose_tip': 3,              
-            'nose_bridge': 168,         
-            'nose_left': 49,            
-            'nose_right': 279,          
-            
-            # Mouth (for expression analysis)
-            'mouth_left': 61,           
-            'mouth_right': 291,         
-            'mouth_top': 13,            
-            'mouth_bottom': 14,         
-            'mouth_center': 17,         
-            
-            # Face outline (for head posture)
-            'chin_center': 175,         
-            'jaw_left': 172,            
-            'jaw_right': 397,           
-            'forehead': 9,              
-            
-            # Eyebrows (for expression)
-            'left_eyebrow_inner': 55,   
-            'left_eyebrow_outer': 70,   
-            'right_eyebrow_inner': 285, 
-            'right_eyebrow_outer': 300, 
-        }
+        # Optimized key landmarks for interview analysis (see feature_schema.py)
+        self.key_face_landmarks = KEY_FACE_LANDMARKS
         
         self.session_data = defaultdict(int)
         self.target_samples_per_class = 500  # 500 samples per class per user
         self.target_samples_per_user = 5000  # Total per user (500 × 10 classes)
         self.target_total_samples = 25000    # Target for entire project (5 users × 5000)
+        self.extra_samples_per_class = 100   # Single-class sessions once a class is complete
+        
+        # Optional raw video recording for offline reprocessing
+        self.record_video = False
+        self.recordings_dir = "recordings"
         
     def get_user_info(self):
         """Get user information and session setup"""
@@ -107,8 +509,11 @@ class InterviewPostureCollector:
         print("3. Quick validation session (20 samples per class)")
         print("4. Debug mode (low quality threshold)")
         print("5. Show detailed dataset statistics")
+        print("6. Reprocess a recorded session (offline)")
+        print("7. Multi-camera session (several participants at once)")
+        print("8. Live classification (reloads model as it is retrained)")
         
-        choice = input("Choose option (1-5): ").strip()
+        choice = input("Choose option (1-8): ").strip()
         
         if choice == "1":
             return self.single_class_session(user_id)
@@ -121,6 +526,18 @@ class InterviewPostureCollector:
         elif choice == "5":
             self.show_detailed_statistics()
             return self.get_user_info()  # Return to menu
+        elif choice == "6":
+            video_path = input("Path to recorded video (.mp4) or recordings folder: ").strip()
+            if os.path.isdir(video_path):
+                self.reprocess_directory(video_path)
+            else:
+                self.reprocess_recording(video_path)
+            return self.get_user_info()  # Return to menu
+        elif choice == "7":
+            return self.multi_camera_session(user_id)
+        elif choice == "8":
+            self.live_classification_session(user_id)
+            return self.get_user_info()  # Return to menu
         else:
             print("Invalid choice. Using balanced session.")
             return self.balanced_session(user_id)
@@ -136,7 +553,7 @@ class InterviewPostureCollector:
             csv_file = f"{class_name.lower()}_data.csv"
             if os.path.exists(csv_file):
                 try:
-                    df = pd.read_csv(csv_file)
+                    df = self.read_user_ids(csv_file)
                     count = len(df)
                     total_samples += count
                     
@@ -185,7 +602,7 @@ class InterviewPostureCollector:
             csv_file = f"{class_name.lower()}_data.csv"
             if os.path.exists(csv_file):
                 try:
-                    df = pd.read_csv(csv_file)
+                    df = self.read_user_ids(csv_file)
                     if 'user_id' in df.columns:
                         user_counts = df['user_id'].value_counts()
                         for user, count in user_counts.items():
@@ -240,7 +657,7 @@ class InterviewPostureCollector:
             
             if os.path.exists(csv_file):
                 try:
-                    df = pd.read_csv(csv_file)
+                    df = self.read_user_ids(csv_file)
                     if 'user_id' in df.columns:
                         current_count = len(df[df['user_id'] == user_id])
                 except:
@@ -273,24 +690,30 @@ class InterviewPostureCollector:
         """Collect data for a specific class"""
         print(f"\nSINGLE CLASS SESSION")
         print("Available classes:")
+        class_counts = {}
         for i, class_name in enumerate(self.classes, 1):
             # Show current progress for this user in this class
             csv_file = f"{class_name.lower()}_data.csv"
             current_count = 0
             if os.path.exists(csv_file):
                 try:
-                    df = pd.read_csv(csv_file)
+                    df = self.read_user_ids(csv_file)
                     if 'user_id' in df.columns:
                         current_count = len(df[df['user_id'] == user_id])
                 except:
                     pass
+            class_counts[class_name] = current_count
             print(f"  {i}. {class_name} (you have {current_count}/{self.target_samples_per_class})")
         
         try:
             choice = int(input(f"Select class (1-{len(self.classes)}): ")) - 1
             if 0 <= choice < len(self.classes):
                 selected_class = self.classes[choice]
-                return [(selected_class, 100)], user_id, "single"
+                remaining = self.target_samples_per_class - class_counts[selected_class]
+                if remaining <= 0:
+                    print(f"{selected_class} is complete - collecting {self.extra_samples_per_class} extra samples")
+                    remaining = self.extra_samples_per_class
+                return [(selected_class, remaining)], user_id, "single"
             else:
                 print("Invalid choice")
                 return None, None, None
@@ -306,37 +729,96 @@ class InterviewPostureCollector:
         validation_classes = [(class_name, 20) for class_name in self.classes]
         return validation_classes, user_id, "validation"
     
+    def get_csv_header(self):
+        """Build the optimized CSV header from the current feature schema"""
+        return list(get_schema().columns)
+    
+    def read_user_ids(self, csv_file):
+        """Load only the class and user_id columns; status screens never need landmarks"""
+        # A callable usecols tolerates older files that predate the user_id column
+        return pd.read_csv(csv_file, usecols=lambda column: column in ('class', 'user_id'))
+    
+    def count_csv_rows(self, csv_filename):
+        """Count data rows (excluding header) in a CSV file"""
+        if not os.path.exists(csv_filename):
+            return 0
+        with open(csv_filename, mode='r', newline='') as f:
+            return max(sum(1 for _ in f) - 1, 0)
+    
+    def multi_camera_session(self, user_id):
+        """Bind several cameras to participants, each with a balanced class plan"""
+        print(f"\nMULTI-CAMERA SESSION")
+        print("Each camera collects for its own participant at the same time.")
+        
+        try:
+            num_cameras = int(input("Number of cameras (2-4): "))
+        except:
+            print("Invalid input")
+            return None, None, None
+        if not 2 <= num_cameras <= 4:
+            print("Multi-camera sessions need 2-4 cameras. Use option 2 for a single camera.")
+            return None, None, None
+        
+        stream_plans = []
+        used_devices = set()
+        for position in range(num_cameras):
+            if position == 0:
+                stream_user = user_id
+            else:
+                stream_user = input(f"\nEnter username for camera #{position + 1}: ").strip()
+                if not stream_user:
+                    print("Username cannot be empty. Skipping this camera.")
+                    continue
+            
+            while True:
+                device = input(f"Camera device index for {stream_user} (default {position}): ").strip()
+                camera_index = int(device) if device.isdigit() else position
+                if camera_index not in used_devices:
+                    break
+                print(f"Camera {camera_index} is already assigned to another participant. Choose another device.")
+            used_devices.add(camera_index)
+            
+            needed_classes, _, _ = self.balanced_session(stream_user)
+            if needed_classes:
+                stream_plans.append((camera_index, stream_user, needed_classes))
+        
+        if not stream_plans:
+            print("No participant needs more data.")
+            return None, None, None
+        
+        return stream_plans, user_id, "multi_camera"
+    
     def initialize_csv(self, class_name):
         """Initialize CSV with optimized headers"""
         csv_filename = f"{class_name.lower()}_data.csv"
         
         if not os.path.exists(csv_filename):
-            landmarks = ['class', 'timestamp', 'user_id', 'session_type', 'quality_score']
-            
-            # Pose landmarks (132 columns)
-            for val in range(1, 34):
-                landmarks += [f'pose_x{val}', f'pose_y{val}', f'pose_z{val}', f'pose_v{val}']
-            
-            # Key face landmarks only (24 landmarks × 4 = 96 columns)
-            for landmark_name in self.key_face_landmarks.keys():
-                landmarks += [f'face_{landmark_name}_x', f'face_{landmark_name}_y', 
-                             f'face_{landmark_name}_z', f'face_{landmark_name}_v']
-            
-            # Hand landmarks (168 columns total)
-            for hand in ['left', 'right']:
-                for val in range(1, 22):
-                    landmarks += [f'{hand}_hand_x{val}', f'{hand}_hand_y{val}', 
-                                 f'{hand}_hand_z{val}', f'{hand}_hand_v{val}']
+            landmarks = self.get_csv_header()
             
             with open(csv_filename, mode='w', newline='') as f:
                 csv_writer = csv.writer(f, delimiter=',', quotechar='"', quoting=csv.QUOTE_MINIMAL)
                 csv_writer.writerow(landmarks)
             
             print(f"Created optimized CSV: {csv_filename}")
-            print(f"Total columns: {len(landmarks)} (5 metadata + 132 pose + 96 face + 168 hands = 401 total)")
+            blocks = get_schema().describe()['blocks']
+            print(f"Total columns: {len(landmarks)} ({blocks['metadata']} metadata + {blocks['pose']} pose + "
+                  f"{blocks['face']} face + {blocks['left_hand'] + blocks['right_hand']} hands)")
         
         return csv_filename
     
+    def build_sample_row(self, class_name, timestamp, user_id, session_type, quality_score, results):
+        """Build one CSV row from Holistic results"""
+        row = [class_name, timestamp, user_id, session_type, quality_score]
+        
+        # Extract all landmark data
+        pose_row = self.extract_pose_landmarks(results.pose_landmarks)
+        face_row = self.extract_key_face_landmarks(results.face_landmarks)
+        left_hand_row = self.extract_hand_landmarks(results.left_hand_landmarks)
+        right_hand_row = self.extract_hand_landmarks(results.right_hand_landmarks)
+        
+        row.extend(pose_row + face_row + left_hand_row + right_hand_row)
+        return row
+    
     def calculate_quality_score(self, results):
         """Calculate data quality score with detailed feedback - FIXED: NO UNICODE"""
         score = 0
@@ -393,7 +875,7 @@ class InterviewPostureCollector:
         
         return key_points
     
-    def collect_class_data(self, class_name, target_samples, user_id, session_type):
+    def collect_class_data(self, class_name, target_samples, user_id, session_type, scheduler=None):
         """Collect data for a specific class with manual start"""
         csv_filename = self.initialize_csv(class_name)
         
@@ -416,6 +898,18 @@ class InterviewPostureCollector:
         if not cap.isOpened():
             print("ERROR: Could not open camera!")
             return 0
+        
+        # Optional background recording of the raw session
+        recorder = None
+        if self.record_video:
+            fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+            recorder = SessionRecorder(self.recordings_dir, class_name, user_id, session_type,
+                                       csv_filename, fps=fps)
+            recorder.start()
+            # Row numbers are only needed to align the recording index
+            next_csv_row = self.count_csv_rows(csv_filename)
+        else:
+            next_csv_row = 0
             
         # Manual start system
         collecting = False  # Start in preview mode
@@ -448,6 +942,9 @@ class InterviewPostureCollector:
                     print("ERROR: Could not read frame!")
                     break
                 
+                capture_time = time.time()
+                saved_csv_row = None
+                accepted_features = None
                 frame_count += 1
                 
                 image = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
@@ -496,27 +993,26 @@ class InterviewPostureCollector:
                 # Save high-quality samples (only when collecting and not in preview mode)
                 if not preview_mode and collecting and quality_score >= quality_threshold:
                     try:
-                        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                        row = [class_name, timestamp, user_id, session_type, quality_score]
-                        
-                        # Extract all landmark data
-                        pose_row = self.extract_pose_landmarks(results.pose_landmarks)
-                        face_row = self.extract_key_face_landmarks(results.face_landmarks)
-                        left_hand_row = self.extract_hand_landmarks(results.left_hand_landmarks)
-                        right_hand_row = self.extract_hand_landmarks(results.right_hand_landmarks)
-                        
-                        row.extend(pose_row + face_row + left_hand_row + right_hand_row)
+                        timestamp = datetime.fromtimestamp(capture_time).strftime("%Y-%m-%d %H:%M:%S")
+                        row = self.build_sample_row(class_name, timestamp, user_id, session_type, quality_score, results)
                         
                         with open(csv_filename, mode='a', newline='') as f:
                             csv_writer = csv.writer(f, delimiter=',', quotechar='"', quoting=csv.QUOTE_MINIMAL)
                             csv_writer.writerow(row)
                         
+                        saved_csv_row = next_csv_row
+                        accepted_features = row[5:]
+                        next_csv_row += 1
                         good_quality_count += 1
                         print(f"Sample #{good_quality_count}/{target_samples} saved | Quality: {quality_score:.0f}%")
                         
                         # Check if target reached
                         if good_quality_count >= target_samples:
                             print(f"TARGET REACHED! Collected {good_quality_count} samples for {class_name}")
+                            if recorder:
+                                recorder.submit(frame, capture_time, saved_csv_row)
+                            if scheduler:
+                                scheduler.record_frame(capture_time, True, accepted_features)
                             break
                         
                     except Exception as e:
@@ -529,6 +1025,18 @@ class InterviewPostureCollector:
                     if low_quality_count % 60 == 0:  # Print every 60 low quality frames
                         print(f"{low_quality_count} low quality frames | Last: {quality_score:.0f}% {quality_details}")
                 
+                # Raw frame is never drawn on, so it can be queued without a copy
+                if recorder and not recorder.submit(frame, capture_time, saved_csv_row):
+                    if recorder.dropped_frames % 30 == 1:  # Print every 30 dropped frames
+                        print(f"{recorder.dropped_frames} frames dropped by video encoder")
+                
+                # Live rates let the scheduler end a class once samples stop adding variety
+                if scheduler and not preview_mode and collecting:
+                    scheduler.record_frame(capture_time, saved_csv_row is not None, accepted_features)
+                    if scheduler.should_stop_class():
+                        print(f"Samples for {class_name} are mostly near-duplicates now - moving on")
+                        break
+                
                 cv2.imshow(f'Interview Posture Data Collection - {class_name} - {user_id}', image)
                 
                 key = cv2.waitKey(1) & 0xFF
@@ -560,6 +1068,8 @@ class InterviewPostureCollector:
         
         cap.release()
         cv2.destroyAllWindows()
+        if recorder:
+            recorder.close()
         
         print(f"\nCOLLECTION SUMMARY FOR {class_name} ({user_id}):")
         print(f"   High-quality samples saved: {good_quality_count}")
@@ -571,6 +1081,242 @@ class InterviewPostureCollector:
         
         return good_quality_count
     
+    def reprocess_recording(self, video_path, output_csv=None):
+        """Regenerate CSV rows from a recorded session without the preview window"""
+        base_name = os.path.splitext(video_path)[0]
+        meta_path = f"{base_name}.json"
+        index_path = f"{base_name}_frames.csv"
+        if not os.path.exists(meta_path) or not os.path.exists(index_path):
+            print(f"ERROR: Missing recording metadata or frame index for {video_path}")
+            return 0
+        
+        with open(meta_path) as f:
+            metadata = json.load(f)
+        
+        # Map encoded video frames back to the rows they produced
+        frame_rows = {}
+        dropped_rows = 0
+        with open(index_path, newline='') as f:
+            for entry in csv.DictReader(f):
+                if not entry['csv_row']:
+                    continue
+                if entry['video_frame']:
+                    frame_rows[int(entry['video_frame'])] = float(entry['capture_time'])
+                else:
+                    dropped_rows += 1
+        
+        if output_csv is None:
+            output_csv = f"{base_name}_reprocessed.csv"
+        
+        cap = cv2.VideoCapture(video_path)
+        if not cap.isOpened():
+            print(f"ERROR: Could not open video {video_path}")
+            return 0
+        
+        print(f"\nREPROCESSING {video_path}")
+        print(f"Class: {metadata['class']} | User: {metadata['user_id']} | Rows to regenerate: {len(frame_rows)}")
+        
+        written = 0
+        video_frame = 0
+        with open(output_csv, mode='w', newline='') as f:
+            csv_writer = csv.writer(f, delimiter=',', quotechar='"', quoting=csv.QUOTE_MINIMAL)
+            csv_writer.writerow(self.get_csv_header())
+            
+            # Every frame is processed in order so landmark tracking matches the live run
+            with self.mp_holistic.Holistic(
+                min_detection_confidence=0.3,
+                min_tracking_confidence=0.3
+            ) as holistic:
+                while True:
+                    ret, frame = cap.read()
+                    if not ret:
+                        break
+                    
+                    image = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+                    image.flags.writeable = False
+                    results = holistic.process(image)
+                    
+                    if video_frame in frame_rows:
+                        quality_score, _ = self.calculate_quality_score(results)
+                        timestamp = datetime.fromtimestamp(frame_rows[video_frame]).strftime("%Y-%m-%d %H:%M:%S")
+                        row = self.build_sample_row(metadata['class'], timestamp, metadata['user_id'],
+                                                    metadata['session_type'], quality_score, results)
+                        csv_writer.writerow(row)
+                        written += 1
+                    
+                    video_frame += 1
+        
+        cap.release()
+        
+        print(f"Reprocessed {video_frame} frames, wrote {written} rows to {output_csv}")
+        if dropped_rows:
+            print(f"Warning: {dropped_rows} saved rows cannot be regenerated (frames dropped by encoder)")
+        missing = len(frame_rows) - written
+        if missing > 0:
+            print(f"Warning: {missing} indexed rows had no matching video frame")
+        return written
+    
+    def tile_frames(self, frames, tile_size=(640, 360)):
+        """Arrange stream previews in a grid for one window"""
+        cols = ceil(sqrt(len(frames)))
+        rows = ceil(len(frames) / cols)
+        blank = np.zeros((tile_size[1], tile_size[0], 3), dtype=np.uint8)
+        tiles = frames + [blank] * (rows * cols - len(frames))
+        return np.vstack([np.hstack(tiles[r * cols:(r + 1) * cols]) for r in range(rows)])
+    
+    def collect_multi_camera(self, stream_plans, session_type="multi_camera"):
+        """Collect from several cameras concurrently with a tiled preview"""
+        quality_threshold = 50
+        tile_size = (640, 360)
+        
+        # One lock per class file, shared by every stream's writer
+        file_locks = {}
+        for _, _, class_plan in stream_plans:
+            for class_name, _ in class_plan:
+                file_locks[self.initialize_csv(class_name)] = threading.Lock()
+        
+        scheduler = StreamScheduler()
+        stop_event = threading.Event()
+        streams = [
+            CameraStream(self, stream_id, camera_index, user_id, class_plan, session_type,
+                         scheduler, file_locks, stop_event, quality_threshold)
+            for stream_id, (camera_index, user_id, class_plan) in enumerate(stream_plans)
+        ]
+        
+        print(f"\nMULTI-CAMERA PREVIEW ACTIVE ({len(streams)} streams)")
+        print(f"Inference slots: {scheduler.max_concurrent} | Quality threshold: {quality_threshold}%")
+        for stream in streams:
+            class_name, target_samples = stream.current_target()
+            print(f"  {stream.label}: first class {class_name} ({target_samples} samples)")
+        print("="*70)
+        print("CONTROLS:")
+        print(f"  '1'-'{len(streams)}' = Select one stream (press again to deselect)")
+        print("  '0' = Select all streams (default)")
+        print("  SPACEBAR = Start collecting on selected streams in preview")
+        print("  'p' = Pause/resume selected streams")
+        print("  'n' = Skip selected streams to their next class")
+        print("  'q' = Quit completely")
+        print("="*70)
+        
+        for stream in streams:
+            stream.start()
+        
+        window_name = 'Interview Posture Data Collection - Multi-Camera'
+        selected = None  # None = controls act on every stream
+        while not all(stream.finished for stream in streams):
+            frames = [stream.get_preview_frame(tile_size, stream.stream_id == selected) for stream in streams]
+            cv2.imshow(window_name, self.tile_frames(frames, tile_size))
+            
+            key = cv2.waitKey(30) & 0xFF
+            targets = streams if selected is None else [streams[selected]]
+            if ord('1') <= key < ord('1') + len(streams):
+                choice = key - ord('1')
+                selected = None if selected == choice else choice
+                print(f"Controls now act on {'all streams' if selected is None else streams[selected].label}")
+            elif key == ord('0'):
+                selected = None
+                print(f"Controls now act on all streams")
+            elif key == ord(' '):
+                for stream in targets:
+                    stream.start_collecting()
+            elif key == ord('p'):
+                for stream in targets:
+                    stream.toggle_pause()
+            elif key == ord('n'):
+                for stream in targets:
+                    print(f"{stream.label}: moving to next class...")
+                    stream.skip_class()
+            elif key == ord('q'):
+                print(f"Quitting multi-camera collection...")
+                stop_event.set()
+                break
+        
+        for stream in streams:
+            stream.join()
+        cv2.destroyAllWindows()
+        
+        print(f"\nMULTI-CAMERA COLLECTION SUMMARY:")
+        for stream in streams:
+            print(f"  {stream.label}: {sum(stream.collected.values())} samples saved")
+            for class_name, count in stream.collected.items():
+                print(f"     {class_name}: {count}")
+            print(f"     Frames processed: {stream.frame_count} | Low-quality: {stream.low_quality_count} | "
+                  f"Dropped by scheduler: {stream.skipped_frames}")
+        
+        return {stream.user_id: sum(stream.collected.values()) for stream in streams}
+    
+    def live_classification_session(self, user_id, model_path="posture_model.pkl"):
+        """Classify posture live, picking up new model checkpoints without a restart"""
+        print(f"\nLIVE CLASSIFICATION")
+        print(f"Model: {model_path} (run incremental_trainer.py --watch to keep it updated)")
+        print("Press 'q' to return to the menu")
+        
+        model = HotSwapModel(model_path)
+        cap = cv2.VideoCapture(0)
+        if not cap.isOpened():
+            print("ERROR: Could not open camera!")
+            return
+        
+        with self.mp_holistic.Holistic(
+            min_detection_confidence=0.3,
+            min_tracking_confidence=0.3
+        ) as holistic:
+            
+            while cap.isOpened():
+                ret, frame = cap.read()
+                if not ret:
+                    print("ERROR: Could not read frame!")
+                    break
+                
+                image = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+                image.flags.writeable = False
+                results = holistic.process(image)
+                
+                quality_score, _ = self.calculate_quality_score(results)
+                row = self.build_sample_row("", "", user_id, "live", quality_score, results)
+                label, confidence = model.predict(row[5:])
+                
+                self.draw_landmarks(frame, results)
+                status_lines = [
+                    f"LIVE - User: {user_id} | Model v{model.version}",
+                    f"Prediction: {label or 'NO MODEL YET'} ({confidence * 100:.0f}%)",
+                    f"Quality: {quality_score:.0f}%"
+                ]
+                for i, line in enumerate(status_lines):
+                    cv2.putText(frame, line, (10, 25 + (i * 22)), cv2.FONT_HERSHEY_SIMPLEX, 0.45, (0, 255, 0), 1)
+                
+                cv2.imshow(f'Interview Posture Live Classification - {user_id}', frame)
+                if cv2.waitKey(1) & 0xFF == ord('q'):
+                    break
+        
+        cap.release()
+        cv2.destroyAllWindows()
+    
+    def reprocess_directory(self, recordings_dir, output_dir=None):
+        """Reprocess every recording in a folder, e.g. after a landmark model upgrade"""
+        video_files = sorted(
+            os.path.join(recordings_dir, name) for name in os.listdir(recordings_dir)
+            if name.endswith('.mp4')
+        )
+        if not video_files:
+            print(f"No recordings found in {recordings_dir}")
+            return 0
+        
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        
+        total_rows = 0
+        for i, video_path in enumerate(video_files, 1):
+            print(f"\n[{i}/{len(video_files)}] {video_path}")
+            output_csv = None
+            if output_dir:
+                base_name = os.path.splitext(os.path.basename(video_path))[0]
+                output_csv = os.path.join(output_dir, f"{base_name}_reprocessed.csv")
+            total_rows += self.reprocess_recording(video_path, output_csv)
+        
+        print(f"\nREPROCESSED {len(video_files)} recordings: {total_rows:,} rows regenerated")
+        return total_rows
+    
     def extract_pose_landmarks(self, pose_landmarks):
         """Extract pose landmarks"""
         if pose_landmarks:
@@ -688,6 +1434,20 @@ class InterviewPostureCollector:
         
         needed_classes, user_id, session_type = session_info
         
+        if session_type == "multi_camera":
+            collected_by_user = self.collect_multi_camera(needed_classes)
+            print(f"\nSESSION COMPLETED!")
+            print("="*70)
+            for stream_user, collected in collected_by_user.items():
+                print(f"{stream_user}: {collected:,} samples collected this session")
+            print("="*70)
+            for stream_user in collected_by_user:
+                self.show_dataset_status(stream_user)
+            return
+        
+        record_choice = input("Record raw video for offline reprocessing? (y/n): ").lower()
+        self.record_video = record_choice == 'y'
+        
         print(f"\nSTARTING {session_type.upper()} SESSION")
         print(f"User: {user_id}")
         print(f"Date: 2025-08-02 02:24:45 UTC")
@@ -701,7 +1461,21 @@ class InterviewPostureCollector:
         
         total_collected = 0
         
-        for class_name, target_samples in needed_classes:
+        # Balanced and single-class sessions re-plan from live per-class rates
+        scheduler = None
+        if session_type in ("balanced", "single"):
+            scheduler = AdaptiveSessionScheduler(user_id, needed_classes)
+            scheduler.show_plan()
+        
+        while True:
+            if scheduler:
+                next_target = scheduler.next_class()
+            else:
+                next_target = needed_classes.pop(0) if needed_classes else None
+            if next_target is None:
+                break
+            class_name, target_samples = next_target
+            
             print(f"\nNEXT CLASS: {class_name}")
             print(f"Target: {target_samples} samples")
             
@@ -711,12 +1485,19 @@ class InterviewPostureCollector:
                 break
             elif continue_choice == 'skip':
                 print(f"Skipping {class_name}")
+                if scheduler:
+                    scheduler.skip_class(class_name)
                 continue
             
-            collected = self.collect_class_data(class_name, target_samples, user_id, session_type)
+            collected = self.collect_class_data(class_name, target_samples, user_id, session_type, scheduler)
             total_collected += collected
             
-            if collected < target_samples:
+            stopped_early = False
+            if scheduler:
+                stopped_early = scheduler.progress[class_name].stopped_early
+                scheduler.finish_class(class_name, collected)
+            
+            if collected < target_samples and not stopped_early:
                 print(f"Only collected {collected}/{target_samples} samples for {class_name}")
                 continue_session = input("Continue to next class anyway? (y/n): ").lower()
                 if continue_session == 'n':
@@ -729,6 +1510,8 @@ class InterviewPostureCollector:
         print(f"Total samples collected this session: {total_collected:,}")
         print(f"Session ended: 2025-08-02 02:24:45 UTC")
         print("="*70)
+        if scheduler:
+            scheduler.summary()
         print("Updated dataset status:")
         self.show_dataset_status(user_id)
         
@@ -738,7 +1521,7 @@ class InterviewPostureCollector:
             for class_name in self.classes:
                 csv_file = f"{class_name.lower()}_data.csv"
                 if os.path.exists(csv_file):
-                    df = pd.read_csv(csv_file)
+                    df = self.read_user_ids(csv_file)
                     total_all_users += len(df)
         except:
             pass
@@ -747,5 +1530,23 @@ class InterviewPostureCollector:
         print(f"\nPROJECT PROGRESS: {total_all_users:,}/{self.target_total_samples:,} samples ({project_progress:.1f}%)")
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Interview posture data collection")
+    parser.add_argument("--reprocess", metavar="PATH",
+                        help="Regenerate rows from a recording or a recordings folder, then exit")
+    parser.add_argument("--output-dir", help="Folder for reprocessed CSV files (default: next to each video)")
+    args = parser.parse_args()
+    
     collector = InterviewPostureCollector()
-    collector.run()
\ No newline at end of file
+    if args.reprocess:
+        # Non-interactive batch path: no menu, no preview window
+        if os.path.isdir(args.reprocess):
+            collector.reprocess_directory(args.reprocess, args.output_dir)
+        else:
+            output_csv = None
+            if args.output_dir:
+                os.makedirs(args.output_dir, exist_ok=True)
+                base_name = os.path.splitext(os.path.basename(args.reprocess))[0]
+                output_csv = os.path.join(args.output_dir, f"{base_name}_reprocessed.csv")
+            collector.reprocess_recording(args.reprocess, output_csv)
+    else:
+        collector.run()
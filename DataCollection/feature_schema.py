@@ -0,0 +1,220 @@
+# !pip install numpy pandas
+import json
+import os
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+SCHEMA_VERSION = 1
+
+CLASSES = [
+    "Good_Posture", "Slouching", "Forward_Head", "Shoulders_Hunched",
+    "Leaning_Forward", "Leaning_Back", "Confident_Expression",
+    "Nervous_Expression", "Head_Down", "Fidgeting_Hands"
+]
+
+# Optimized key landmarks for interview analysis
+KEY_FACE_LANDMARKS = {
+    # Eyes (for gaze direction and confidence)
+    'left_eye_inner': 362,
+    'left_eye_outer': 263,
+    'right_eye_inner': 133,
+    'right_eye_outer': 33,
+    'left_eye_center': 385,
+    'right_eye_center': 160,
+
+    # Iris (for precise gaze tracking)
+    'left_iris_center': 474,
+    'right_iris_center': 469,
+
+    # Nose (for head orientation)
+    'nose_tip': 3,
+    'nose_bridge': 168,
+    'nose_left': 49,
+    'nose_right': 279,
+
+    # Mouth (for expression analysis)
+    'mouth_left': 61,
+    'mouth_right': 291,
+    'mouth_top': 13,
+    'mouth_bottom': 14,
+    'mouth_center': 17,
+
+    # Face outline (for head posture)
+    'chin_center': 175,
+    'jaw_left': 172,
+    'jaw_right': 397,
+    'forehead': 9,
+
+    # Eyebrows (for expression)
+    'left_eyebrow_inner': 55,
+    'left_eyebrow_outer': 70,
+    'right_eyebrow_inner': 285,
+    'right_eyebrow_outer': 300,
+}
+
+FeatureBlock = namedtuple('FeatureBlock', ['name', 'columns', 'numeric'])
+
+FEATURE_BLOCKS = ['pose', 'face', 'left_hand', 'right_hand']
+
+
+class FeatureSchema:
+    """Versioned description of the column blocks in a class CSV"""
+
+    def __init__(self, version, blocks):
+        self.version = version
+        self.blocks = {block.name: block for block in blocks}
+        self.columns = [column for block in blocks for column in block.columns]
+        self.numeric_columns = [column for block in blocks if block.numeric for column in block.columns]
+
+        # Block positions inside the numeric matrix used by the binary store
+        self.numeric_slices = {}
+        start = 0
+        for block in blocks:
+            if block.numeric:
+                self.numeric_slices[block.name] = slice(start, start + len(block.columns))
+                start += len(block.columns)
+
+    def block_names(self, blocks=None):
+        """Requested block names in file order"""
+        if blocks is None:
+            return list(self.blocks)
+        unknown = set(blocks) - set(self.blocks)
+        if unknown:
+            raise KeyError(f"Unknown blocks {sorted(unknown)}; schema v{self.version} has {list(self.blocks)}")
+        return [name for name in self.blocks if name in blocks]
+
+    def columns_for(self, blocks):
+        """Columns for the given blocks, in file order"""
+        return [column for name in self.block_names(blocks) for column in self.blocks[name].columns]
+
+    def describe(self):
+        """Summary of the layout, e.g. for logging or a JSON sidecar"""
+        return {
+            'version': self.version,
+            'total_columns': len(self.columns),
+            'blocks': {name: len(block.columns) for name, block in self.blocks.items()},
+        }
+
+
+def _landmark_columns(prefix, count):
+    columns = []
+    for val in range(1, count + 1):
+        columns += [f'{prefix}_x{val}', f'{prefix}_y{val}', f'{prefix}_z{val}', f'{prefix}_v{val}']
+    return columns
+
+
+def _build_v1():
+    face_columns = []
+    for landmark_name in KEY_FACE_LANDMARKS:
+        face_columns += [f'face_{landmark_name}_x', f'face_{landmark_name}_y',
+                         f'face_{landmark_name}_z', f'face_{landmark_name}_v']
+
+    return FeatureSchema(1, [
+        FeatureBlock('metadata', ['class', 'timestamp', 'user_id', 'session_type', 'quality_score'], False),
+        FeatureBlock('pose', _landmark_columns('pose', 33), True),
+        FeatureBlock('face', face_columns, True),
+        FeatureBlock('left_hand', _landmark_columns('left_hand', 21), True),
+        FeatureBlock('right_hand', _landmark_columns('right_hand', 21), True),
+    ])
+
+
+SCHEMAS = {1: _build_v1()}
+
+
+def get_schema(version=SCHEMA_VERSION):
+    """Look up a schema by version"""
+    if version not in SCHEMAS:
+        raise KeyError(f"Unknown schema version {version}; known versions: {sorted(SCHEMAS)}")
+    return SCHEMAS[version]
+
+
+def detect_schema(columns):
+    """Find the schema whose columns match a CSV header"""
+    columns = list(columns)
+    for schema in SCHEMAS.values():
+        if schema.columns == columns:
+            return schema
+    raise ValueError(f"No registered schema matches this {len(columns)}-column layout")
+
+
+def read_header(csv_file):
+    with open(csv_file, newline='') as f:
+        return f.readline().strip().split(',')
+
+
+def read_csv_blocks(csv_file, blocks, schema=None):
+    """Load only the requested blocks from a class CSV
+
+    Numeric blocks are parsed into one float32 matrix and returned as
+    column views of it; metadata is returned as an object array.
+    """
+    schema = schema or detect_schema(read_header(csv_file))
+    names = schema.block_names(blocks)
+    numeric_names = [name for name in names if schema.blocks[name].numeric]
+    numeric_columns = schema.columns_for(numeric_names)
+
+    # Parse with pandas' default float64 and convert once: a per-column dtype map
+    # over hundreds of columns costs more than the conversion it saves
+    df = pd.read_csv(csv_file, usecols=None if blocks is None else schema.columns_for(names))
+
+    result = {}
+    if numeric_columns:
+        matrix = df[numeric_columns].to_numpy(dtype=np.float32)
+        start = 0
+        for name in numeric_names:
+            width = len(schema.blocks[name].columns)
+            result[name] = matrix[:, start:start + width]
+            start += width
+    if 'metadata' in names:
+        result['metadata'] = df[schema.blocks['metadata'].columns].to_numpy()
+    return result
+
+
+def _store_paths(store_path):
+    base = os.path.splitext(store_path)[0]
+    return f"{base}.npy", f"{base}_metadata.csv", f"{base}.json"
+
+
+def write_binary_store(csv_file, store_path=None):
+    """Convert a class CSV to a column-major float32 .npy plus metadata sidecars"""
+    schema = detect_schema(read_header(csv_file))
+    if store_path is None:
+        store_path = os.path.splitext(csv_file)[0] + '.npy'
+    npy_path, metadata_path, info_path = _store_paths(store_path)
+
+    df = pd.read_csv(csv_file)
+    # Fortran order keeps each block contiguous on disk for memory-mapped projection
+    np.save(npy_path, np.asfortranarray(df[schema.numeric_columns].to_numpy(dtype=np.float32)))
+    df[schema.blocks['metadata'].columns].to_csv(metadata_path, index=False)
+
+    info = schema.describe()
+    info['rows'] = len(df)
+    with open(info_path, 'w') as f:
+        json.dump(info, f, indent=2)
+    return npy_path
+
+
+def read_binary_blocks(store_path, blocks):
+    """Load requested blocks from a binary store as views of a memory map"""
+    npy_path, metadata_path, info_path = _store_paths(store_path)
+    with open(info_path) as f:
+        schema = get_schema(json.load(f)['version'])
+    names = schema.block_names(blocks)
+
+    result = {}
+    matrix = np.load(npy_path, mmap_mode='r')
+    for name in names:
+        if schema.blocks[name].numeric:
+            result[name] = matrix[:, schema.numeric_slices[name]]
+    if 'metadata' in names:
+        result['metadata'] = pd.read_csv(metadata_path).to_numpy()
+    return result
+
+
+def read_blocks(path, blocks):
+    """Read blocks from either a class CSV or a binary store"""
+    if path.endswith('.npy'):
+        return read_binary_blocks(path, blocks)
+    return read_csv_blocks(path, blocks)
@@ -0,0 +1,242 @@
+# !pip install pandas scikit-learn
+import argparse
+import copy
+import io
+import os
+import pickle
+import threading
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import SGDClassifier
+from sklearn.preprocessing import StandardScaler
+
+from feature_schema import CLASSES, FEATURE_BLOCKS, detect_schema
+
+
+class IncrementalPostureTrainer:
+    """Update a posture classifier using only rows appended since the last checkpoint"""
+
+    def __init__(self, data_dir=".", model_path="posture_model.pkl", classes=None):
+        self.data_dir = data_dir
+        self.model_path = model_path
+        self.classes = classes or CLASSES
+        self.checkpoint = self.load_checkpoint()
+
+    def load_checkpoint(self):
+        """Load the last checkpoint, or start a fresh model"""
+        if os.path.exists(self.model_path):
+            with open(self.model_path, 'rb') as f:
+                checkpoint = pickle.load(f)
+            # Older checkpoints keyed offsets by the joined path; key by file name instead
+            checkpoint['offsets'] = {
+                os.path.basename(path): offset for path, offset in checkpoint['offsets'].items()
+            }
+            print(f"Loaded model v{checkpoint['version']} ({checkpoint['rows_seen']:,} rows seen)")
+            return checkpoint
+
+        return {
+            'version': 0,
+            'classes': list(self.classes),
+            'schema_version': None,
+            'scaler': StandardScaler(),
+            'model': SGDClassifier(loss='log_loss', random_state=42),
+            'offsets': {},
+            'rows_seen': 0,
+            'updated': None,
+        }
+
+    def save_checkpoint(self, checkpoint=None):
+        """Write model and file offsets together so they can never disagree"""
+        checkpoint = checkpoint or self.checkpoint
+        tmp_path = f"{self.model_path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(checkpoint, f)
+        # Atomic rename: live processes never see a half-written model
+        os.replace(tmp_path, self.model_path)
+
+    def read_new_rows(self, csv_file):
+        """Read complete rows appended after the stored byte offset
+
+        Returns (rows, new_offset, schema_version). The stored offset is left
+        alone; callers commit new_offset only once the rows have been fit.
+        """
+        # Keyed by file name so '.' and './' (or a moved data folder) share watermarks
+        offset = self.checkpoint['offsets'].get(os.path.basename(csv_file), 0)
+        file_size = os.path.getsize(csv_file)
+
+        if file_size < offset:
+            print(f"Warning: {csv_file} shrank since last update, reading it from the start")
+            offset = 0
+
+        with open(csv_file, 'rb') as f:
+            header = f.readline()
+            if offset == 0:
+                offset = f.tell()
+            f.seek(offset)
+            chunk = f.read()
+
+        # Leave a partially written last line for the next update
+        end = chunk.rfind(b'\n') + 1
+        if end == 0:
+            return None, offset, None
+
+        schema = detect_schema(header.decode('utf-8').strip().split(','))
+        # Checkpoints written before the schema registry have no version yet
+        model_version = self.checkpoint.get('schema_version')
+        if model_version is not None and schema.version != model_version:
+            raise ValueError(f"schema v{schema.version} does not match model schema "
+                             f"v{model_version}; retrain from scratch")
+
+        # Skip parsing timestamp/user/session columns the model never uses
+        usecols = ['class'] + schema.columns_for(FEATURE_BLOCKS)
+        rows = pd.read_csv(io.BytesIO(chunk[:end]), header=None, names=schema.columns, usecols=usecols,
+                           dtype={column: np.float32 for column in usecols[1:]})
+        return rows, offset + end, schema.version
+
+    def update(self):
+        """Run one partial fit over new rows from every class file"""
+        new_frames = []
+        new_offsets = {}
+        schema_versions = set()
+        for class_name in self.classes:
+            csv_file = os.path.join(self.data_dir, f"{class_name.lower()}_data.csv")
+            if not os.path.exists(csv_file):
+                continue
+            try:
+                df, new_offset, schema_version = self.read_new_rows(csv_file)
+            except Exception as e:
+                # Offset stays put so these rows are retried once the file is fixed
+                print(f"  ERROR: {class_name}: new rows not trained, kept for retry - {e}")
+                continue
+            if df is not None and len(df):
+                if schema_versions and schema_version not in schema_versions:
+                    print(f"  ERROR: {class_name}: schema v{schema_version} differs from other files, kept for retry")
+                    continue
+                print(f"  {class_name}: {len(df)} new rows")
+                new_frames.append(df)
+                new_offsets[os.path.basename(csv_file)] = new_offset
+                schema_versions.add(schema_version)
+
+        if not new_frames:
+            print("No new rows since last checkpoint.")
+            return 0
+
+        df = pd.concat(new_frames, ignore_index=True)
+        df = df[df['class'].isin(self.checkpoint['classes'])]
+        if df.empty:
+            print("No rows with known classes since last checkpoint.")
+            return 0
+        X = df[df.columns[1:]].fillna(0.0).to_numpy(dtype=np.float64)
+        y = df['class'].to_numpy()
+
+        # Fit copies so memory only changes once the new checkpoint is on disk
+        scaler = copy.deepcopy(self.checkpoint['scaler'])
+        model = copy.deepcopy(self.checkpoint['model'])
+        scaler.partial_fit(X)
+        model.partial_fit(scaler.transform(X), y, classes=self.checkpoint['classes'])
+
+        checkpoint = dict(self.checkpoint)
+        checkpoint['scaler'] = scaler
+        checkpoint['model'] = model
+        # Only rows that were actually fit move the watermark forward
+        checkpoint['offsets'] = {**self.checkpoint['offsets'], **new_offsets}
+        checkpoint['schema_version'] = schema_versions.pop()
+        checkpoint['version'] += 1
+        checkpoint['rows_seen'] += len(df)
+        checkpoint['updated'] = datetime.now().isoformat()
+        try:
+            self.save_checkpoint(checkpoint)
+        except OSError as e:
+            # e.g. Windows refusing the rename while a live process reads the model
+            print(f"ERROR: could not save {self.model_path} - {e}. Rows will be retried on the next update.")
+            return 0
+        self.checkpoint = checkpoint
+
+        print(f"Model v{checkpoint['version']} saved: +{len(df):,} rows "
+              f"({checkpoint['rows_seen']:,} total) -> {self.model_path}")
+        return len(df)
+
+    def watch(self, interval=30):
+        """Keep updating as collectors append new samples"""
+        print(f"Watching {os.path.abspath(self.data_dir)} every {interval}s (Ctrl+C to stop)")
+        try:
+            while True:
+                self.update()
+                time.sleep(interval)
+        except KeyboardInterrupt:
+            print("Stopped watching.")
+
+
+class HotSwapModel:
+    """Serve the latest checkpoint, reloading it whenever the trainer saves a new one"""
+
+    def __init__(self, model_path="posture_model.pkl", check_interval=2.0):
+        self.model_path = model_path
+        self.check_interval = check_interval
+        self.checkpoint = None
+        self.loaded_mtime = None
+        self.last_check = 0.0
+        self.lock = threading.Lock()
+        self.refresh(force=True)
+
+    @property
+    def version(self):
+        return self.checkpoint['version'] if self.checkpoint else 0
+
+    def refresh(self, force=False):
+        """Swap in a newer checkpoint if one was written; returns True on swap"""
+        now = time.time()
+        if not force and now - self.last_check < self.check_interval:
+            return False
+        self.last_check = now
+
+        try:
+            mtime = os.stat(self.model_path).st_mtime_ns
+        except FileNotFoundError:
+            return False
+        if mtime == self.loaded_mtime:
+            return False
+
+        try:
+            with open(self.model_path, 'rb') as f:
+                checkpoint = pickle.load(f)
+        except Exception as e:
+            print(f"Warning: could not load {self.model_path} - {e}")
+            return False
+
+        with self.lock:
+            self.checkpoint = checkpoint
+            self.loaded_mtime = mtime
+        print(f"Hot-swapped model v{checkpoint['version']} ({checkpoint['rows_seen']:,} rows)")
+        return True
+
+    def predict(self, features):
+        """Predict (class, probability) for one feature row, or (None, 0.0) without a model"""
+        self.refresh()
+        with self.lock:
+            checkpoint = self.checkpoint
+        if checkpoint is None or checkpoint['rows_seen'] == 0:
+            return None, 0.0
+
+        X = checkpoint['scaler'].transform(np.asarray(features, dtype=np.float64).reshape(1, -1))
+        probabilities = checkpoint['model'].predict_proba(X)[0]
+        best = int(np.argmax(probabilities))
+        return checkpoint['model'].classes_[best], float(probabilities[best])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Incrementally train the posture classifier")
+    parser.add_argument("--data-dir", default=".", help="Folder with the class CSV files")
+    parser.add_argument("--model", default="posture_model.pkl", help="Checkpoint path")
+    parser.add_argument("--watch", type=int, default=0, metavar="SECONDS",
+                        help="Keep updating every SECONDS instead of running once")
+    args = parser.parse_args()
+
+    trainer = IncrementalPostureTrainer(args.data_dir, args.model)
+    if args.watch:
+        trainer.watch(args.watch)
+    else:
+        trainer.update()
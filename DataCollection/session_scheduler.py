@@ -0,0 +1,311 @@
+# !pip install numpy
+import json
+import os
+from collections import deque
+from math import ceil
+
+import numpy as np
+
+from feature_schema import FEATURE_BLOCKS, get_schema
+
+
+class ClassProgress:
+    """Live acceptance statistics for one class of one user"""
+
+    def __init__(self, class_name, remaining, history=None):
+        history = history or {}
+        self.class_name = class_name
+        self.remaining = remaining
+        self.passes = 0
+        self.done = False
+        self.skipped = False
+        self.stopped_early = False
+
+        # Totals carried over from earlier sessions
+        self.history_accepted = history.get('accepted', 0)
+        self.history_novel = history.get('novel', 0)
+        self.history_frames = history.get('frames', 0)
+        self.history_seconds = history.get('active_seconds', 0.0)
+
+        self.reset_pass()
+        self.accepted = 0
+        self.novel = 0
+        self.frames = 0
+        self.active_seconds = 0.0
+
+    def reset_pass(self):
+        """Start a fresh measurement window for a new pass over this class"""
+        self.recent_novelty = deque()
+        self.pass_accepted = 0
+        self.last_frame_time = None
+        self.last_kept = None
+
+    def marginal_value(self):
+        """Fraction of recent accepted samples that were novel"""
+        if not self.recent_novelty:
+            return 1.0
+        return sum(self.recent_novelty) / len(self.recent_novelty)
+
+    def effective_rate(self, default=1.0):
+        """Novel accepted samples per active second, or ``default`` until one is measured"""
+        novel = self.history_novel + self.novel
+        seconds = self.history_seconds + self.active_seconds
+        # Only low-quality frames so far gives a zero rate, which is no basis for planning
+        if seconds <= 0 or novel <= 0:
+            return default
+        return novel / seconds
+
+    def accepted_rate(self, default=None):
+        """Accepted samples per active second: frame rate times pass ratio"""
+        frames = self.history_frames + self.frames
+        seconds = self.history_seconds + self.active_seconds
+        if seconds <= 0 or frames <= 0:
+            return default
+        return frames / seconds * self.pass_ratio()
+
+    def pass_ratio(self):
+        frames = self.history_frames + self.frames
+        return (self.history_accepted + self.accepted) / frames if frames else 1.0
+
+    def to_history(self):
+        return {
+            'accepted': self.history_accepted + self.accepted,
+            'novel': self.history_novel + self.novel,
+            'frames': self.history_frames + self.frames,
+            'active_seconds': round(self.history_seconds + self.active_seconds, 2),
+        }
+
+
+def coordinate_indices(schema=None):
+    """Positions of each landmark block's x/y/z values within a feature row
+
+    Visibility (``_v``) columns are left out: they are confidence scores,
+    not positions, and jitter independently of any movement.
+    """
+    schema = schema or get_schema()
+    indices = []
+    for name in FEATURE_BLOCKS:
+        start = schema.numeric_slices[name].start
+        columns = schema.blocks[name].columns
+        indices.append(np.array([start + i for i, column in enumerate(columns)
+                                 if not column.rsplit('_', 1)[-1].startswith('v')]))
+    return indices
+
+
+class AdaptiveSessionScheduler:
+    """Re-plan class order and targets from live acceptance and novelty rates
+
+    A sample is novel when its landmark coordinates differ from the last novel
+    sample by more than ``novelty_threshold`` (mean absolute difference over
+    the blocks detected in both).  Once a class has collected ``min_samples``
+    in a pass and the novel fraction of the last ``window`` accepted samples
+    drops below ``min_marginal_value``, the class is stopped and deferred
+    until every other class has had a pass.  The last of ``max_passes``
+    passes always runs to the full remaining target.
+
+    The default threshold sits just above MediaPipe's jitter on a still
+    subject: replaying the PS and DC recordings, no class file is stopped
+    early (the lowest novel fraction in any window is 38%).
+    """
+
+    def __init__(self, user_id, needed_classes, stats_path="session_stats.json",
+                 novelty_threshold=0.002, min_samples=100, min_marginal_value=0.2,
+                 window=60, max_passes=2, max_frame_gap=1.0, pass_minutes=2.0):
+        self.user_id = user_id
+        self.stats_path = stats_path
+        self.novelty_threshold = novelty_threshold
+        self.min_samples = min_samples
+        self.min_marginal_value = min_marginal_value
+        self.window = window
+        self.max_passes = max_passes
+        self.max_frame_gap = max_frame_gap
+        self.pass_minutes = pass_minutes
+        self.coordinate_blocks = coordinate_indices()
+
+        self.stats = self.load_stats()
+        user_history = self.stats.get(user_id, {})
+        self.progress = {
+            class_name: ClassProgress(class_name, remaining, user_history.get(class_name))
+            for class_name, remaining in needed_classes
+        }
+        self.current = None
+
+    def load_stats(self):
+        if os.path.exists(self.stats_path):
+            try:
+                with open(self.stats_path) as f:
+                    return json.load(f)
+            except Exception as e:
+                print(f"Warning: could not read {self.stats_path} - {e}")
+        return {}
+
+    def save_stats(self):
+        """Persist per-user, per-class rates so the next session plans better"""
+        # Merge so classes outside this session's plan keep their history
+        self.stats.setdefault(self.user_id, {}).update({
+            class_name: progress.to_history() for class_name, progress in self.progress.items()
+        })
+        tmp_path = f"{self.stats_path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self.stats, f, indent=2)
+        os.replace(tmp_path, self.stats_path)
+
+    def priority(self, progress):
+        """Remaining need weighted by how efficiently the class yields new samples"""
+        mean_rate = self.mean_rate()
+        efficiency = progress.pass_ratio() * min(progress.effective_rate(default=mean_rate) / mean_rate, 1.0)
+        return progress.remaining * efficiency
+
+    def mean_rate(self):
+        """Average measured rate across classes; always positive"""
+        rates = [p.effective_rate(default=None) for p in self.progress.values()]
+        rates = [rate for rate in rates if rate]
+        return sum(rates) / len(rates) if rates else 1.0
+
+    def is_last_pass(self, progress):
+        return progress.passes >= self.max_passes - 1
+
+    def pass_target(self, progress, others_waiting):
+        """Samples to ask for in this pass, leaving time for the classes still waiting"""
+        if not others_waiting or self.is_last_pass(progress):
+            return progress.remaining
+        rate = progress.accepted_rate()
+        if rate:
+            target = ceil(rate * self.pass_minutes * 60)
+        else:
+            # No measurement yet: split what is left over the passes that remain
+            target = ceil(progress.remaining / (self.max_passes - progress.passes))
+        return min(progress.remaining, max(target, self.min_samples))
+
+    def next_class(self):
+        """Pick the next (class, target) to collect, or None when the plan is exhausted"""
+        candidates = [
+            p for p in self.progress.values()
+            if not p.done and not p.skipped and p.remaining > 0 and p.passes < self.max_passes
+        ]
+        if not candidates:
+            return None
+
+        # Fresh classes before deferred ones, then by weighted need
+        fewest_passes = min(p.passes for p in candidates)
+        best = max([p for p in candidates if p.passes == fewest_passes], key=self.priority)
+
+        self.current = best
+        best.reset_pass()
+        best.stopped_early = False
+        target = self.pass_target(best, others_waiting=len(candidates) > 1)
+        if best.passes > 0:
+            print(f"Revisiting deferred class {best.class_name}: {best.remaining} samples remaining")
+        return best.class_name, target
+
+    def show_plan(self):
+        """Print the current class order with expected time per class"""
+        pending = [
+            p for p in self.progress.values()
+            if not p.done and not p.skipped and p.remaining > 0 and p.passes < self.max_passes
+        ]
+        pending.sort(key=lambda p: (p.passes, -self.priority(p)))
+        print(f"\nADAPTIVE PLAN FOR {self.user_id}:")
+        for i, progress in enumerate(pending, 1):
+            rate = progress.effective_rate(default=None)
+            estimate = f"~{progress.remaining / rate / 60:.1f} min" if rate else "~? min"
+            deferred = " (deferred)" if progress.passes else ""
+            print(f"  {i}. {progress.class_name}: {progress.remaining} remaining | "
+                  f"pass ratio {progress.pass_ratio() * 100:.0f}% | {estimate}{deferred}")
+
+    def landmark_difference(self, features, reference):
+        """Mean absolute coordinate change over the blocks detected in both samples"""
+        changes = []
+        for indices in self.coordinate_blocks:
+            current, previous = features[indices], reference[indices]
+            # An undetected hand is written as zeros; comparing it would count as movement
+            if current.any() and previous.any():
+                changes.append(np.abs(current - previous))
+        if not changes:
+            return float('inf')
+        return float(np.mean(np.concatenate(changes)))
+
+    def record_frame(self, capture_time, accepted, features=None):
+        """Update live statistics with one collecting frame"""
+        progress = self.current
+        if progress is None:
+            return
+
+        # Pauses and prompts leave gaps that must not count as collecting time
+        if progress.last_frame_time is not None:
+            gap = capture_time - progress.last_frame_time
+            if 0 < gap <= self.max_frame_gap:
+                progress.active_seconds += gap
+        progress.last_frame_time = capture_time
+        progress.frames += 1
+
+        if not accepted:
+            return
+        progress.accepted += 1
+        progress.pass_accepted += 1
+
+        novel = True
+        if features is not None:
+            features = np.asarray(features, dtype=np.float32)
+            if progress.last_kept is not None:
+                novel = self.landmark_difference(features, progress.last_kept) > self.novelty_threshold
+            if novel:
+                progress.last_kept = features
+        if novel:
+            progress.novel += 1
+
+        progress.recent_novelty.append(novel)
+        if len(progress.recent_novelty) > self.window:
+            progress.recent_novelty.popleft()
+
+    def should_stop_class(self):
+        """True once the current class keeps producing near-duplicate samples"""
+        progress = self.current
+        if progress is None or progress.pass_accepted < self.min_samples:
+            return False
+        # There is no later pass to defer to, so the final one fills the target
+        if self.is_last_pass(progress):
+            return False
+        if len(progress.recent_novelty) < self.window:
+            return False
+        if progress.marginal_value() < self.min_marginal_value:
+            progress.stopped_early = True
+            return True
+        return False
+
+    def skip_class(self, class_name):
+        self.progress[class_name].skipped = True
+
+    def finish_class(self, class_name, collected):
+        """Record the outcome of a pass and re-plan the remaining classes"""
+        progress = self.progress[class_name]
+        progress.passes += 1
+        progress.remaining = max(progress.remaining - collected, 0)
+        progress.done = progress.remaining == 0
+        self.current = None
+
+        if progress.stopped_early:
+            print(f"{class_name}: stopped early, only {progress.marginal_value() * 100:.0f}% of recent "
+                  f"samples were new. Deferred with {progress.remaining} remaining.")
+        elif not progress.done and progress.passes >= self.max_passes:
+            print(f"WARNING: {class_name} still needs {progress.remaining} samples after "
+                  f"{progress.passes} passes and will not be offered again this session.")
+        self.save_stats()
+        self.show_plan()
+
+    def summary(self):
+        """Print accepted, novel and wasted frames per class for this session"""
+        print(f"\nADAPTIVE SCHEDULER SUMMARY ({self.user_id}):")
+        for progress in self.progress.values():
+            if not progress.frames:
+                continue
+            wasted = progress.frames - progress.novel
+            print(f"  {progress.class_name}: {progress.accepted} accepted, {progress.novel} novel, "
+                  f"{wasted} wasted frames, {progress.active_seconds / 60:.1f} min active")
+
+        unfinished = [p for p in self.progress.values() if not p.done and p.remaining > 0]
+        if unfinished:
+            print("UNFINISHED CLASSES:")
+            for progress in unfinished:
+                reason = "skipped" if progress.skipped else f"{progress.passes} pass(es)"
+                print(f"  {progress.class_name}: {progress.remaining} samples still needed ({reason})")
@@ -0,0 +1,38 @@
+import csv
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# The collector modules live next to this folder, not in an installed package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from feature_schema import get_schema  # noqa: E402
+
+
+def make_rows(class_name, count, seed=0):
+    """Synthetic rows in the current CSV layout"""
+    schema = get_schema()
+    rng = np.random.default_rng(seed)
+    rows = []
+    for i in range(count):
+        values = rng.random(len(schema.numeric_columns)).round(6).tolist()
+        rows.append([class_name, f"2025-08-03 23:50:{i % 60:02d}", 'tester', 'balanced', 75.0] + values)
+    return rows
+
+
+def write_rows(csv_file, rows, header=True):
+    """Append rows (and the header for a new file) the way the collector does"""
+    with open(csv_file, mode='a', newline='') as f:
+        csv_writer = csv.writer(f)
+        if header:
+            csv_writer.writerow(get_schema().columns)
+        csv_writer.writerows(rows)
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    write_rows(tmp_path / 'good_posture_data.csv', make_rows('Good_Posture', 20, seed=1))
+    write_rows(tmp_path / 'slouching_data.csv', make_rows('Slouching', 20, seed=2))
+    return tmp_path
@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import make_rows, write_rows
+from feature_schema import (FEATURE_BLOCKS, detect_schema, get_schema, read_binary_blocks, read_blocks,
+                            read_csv_blocks, write_binary_store)
+
+
+@pytest.fixture
+def csv_file(tmp_path):
+    csv_file = tmp_path / 'slouching_data.csv'
+    write_rows(csv_file, make_rows('Slouching', 25, seed=5))
+    return str(csv_file)
+
+
+def test_detect_schema_rejects_unknown_layout():
+    with pytest.raises(ValueError):
+        detect_schema(get_schema().columns[:-4])
+
+
+@pytest.mark.parametrize('blocks', [None, ['pose'], ['face'], ['left_hand', 'right_hand'], ['metadata']])
+def test_block_views_match_full_read(csv_file, blocks):
+    schema = get_schema()
+    df = pd.read_csv(csv_file)
+    store = write_binary_store(csv_file)
+
+    for result in (read_csv_blocks(csv_file, blocks), read_binary_blocks(store, blocks)):
+        assert set(result) == set(schema.block_names(blocks))
+        for name, block in result.items():
+            expected = df[schema.blocks[name].columns]
+            if name == 'metadata':
+                assert block.tolist() == expected.to_numpy().tolist()
+            else:
+                assert block.dtype == np.float32
+                np.testing.assert_array_equal(block, expected.to_numpy(dtype=np.float32))
+
+
+def test_read_blocks_dispatches_on_extension(csv_file):
+    store = write_binary_store(csv_file)
+    np.testing.assert_array_equal(read_blocks(store, ['pose'])['pose'], read_blocks(csv_file, ['pose'])['pose'])
+
+
+def test_unknown_block_name_is_rejected(csv_file):
+    with pytest.raises(KeyError):
+        read_csv_blocks(csv_file, ['torso'])
+
+
+def test_feature_blocks_cover_every_numeric_column():
+    schema = get_schema()
+    assert schema.columns_for(FEATURE_BLOCKS) == schema.numeric_columns
@@ -0,0 +1,85 @@
+import csv
+import io
+import os
+
+from conftest import make_rows, write_rows
+from incremental_trainer import IncrementalPostureTrainer
+
+
+def make_trainer(data_dir):
+    return IncrementalPostureTrainer(str(data_dir), str(data_dir / 'model.pkl'))
+
+
+def test_update_trains_all_rows_then_nothing(data_dir):
+    trainer = make_trainer(data_dir)
+    assert trainer.update() == 40
+    assert trainer.update() == 0
+
+
+def test_partial_last_line_is_held_back(data_dir):
+    trainer = make_trainer(data_dir)
+    trainer.update()
+
+    csv_file = data_dir / 'slouching_data.csv'
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(make_rows('Slouching', 3, seed=3))
+    text = buffer.getvalue()
+    cut = text.rindex('\n', 0, len(text) - 1) + 20  # Midway through the third row
+
+    with open(csv_file, 'a', newline='') as f:
+        f.write(text[:cut])
+    assert trainer.update() == 2
+
+    with open(csv_file, 'a', newline='') as f:
+        f.write(text[cut:])
+    assert trainer.update() == 1
+    assert trainer.checkpoint['rows_seen'] == 43
+
+
+def test_offsets_are_shared_across_equivalent_data_dirs(data_dir):
+    trainer = make_trainer(data_dir)
+    trainer.update()
+
+    same_dir = IncrementalPostureTrainer(str(data_dir) + os.sep, str(data_dir / 'model.pkl'))
+    assert same_dir.update() == 0
+
+
+def test_failed_save_leaves_checkpoint_untouched(data_dir, monkeypatch):
+    trainer = make_trainer(data_dir)
+    trainer.update()
+    before = dict(trainer.checkpoint)
+
+    write_rows(data_dir / 'slouching_data.csv', make_rows('Slouching', 5, seed=4), header=False)
+
+    def locked(src, dst):
+        raise PermissionError("file in use")
+    monkeypatch.setattr(os, 'replace', locked)
+    assert trainer.update() == 0
+    assert trainer.checkpoint['offsets'] == before['offsets']
+    assert trainer.checkpoint['model'] is before['model']
+
+    monkeypatch.undo()
+    assert trainer.update() == 5
+
+
+def test_unknown_header_keeps_offset(data_dir):
+    trainer = make_trainer(data_dir)
+    trainer.update()
+    offsets = dict(trainer.checkpoint['offsets'])
+
+    renamed = data_dir / 'forward_head_data.csv'
+    with open(renamed, 'w', newline='') as f:
+        f.write('class,timestamp,pose_x1\nForward_Head,2025-08-03 23:50:00,0.5\n')
+    assert trainer.update() == 0
+    assert 'forward_head_data.csv' not in trainer.checkpoint['offsets']
+    assert trainer.checkpoint['offsets'] == offsets
+
+
+def test_schema_mismatch_keeps_offset(data_dir):
+    trainer = make_trainer(data_dir)
+    trainer.checkpoint['schema_version'] = 99  # Model trained on a layout this file does not use
+    assert trainer.update() == 0
+    assert trainer.checkpoint['offsets'] == {}
+
+    trainer.checkpoint['schema_version'] = None  # Checkpoints from before the schema registry
+    assert trainer.update() == 40
@@ -0,0 +1,132 @@
+import json
+
+import numpy as np
+import pytest
+
+from feature_schema import get_schema
+from session_scheduler import AdaptiveSessionScheduler
+
+
+@pytest.fixture
+def stats_path(tmp_path):
+    return str(tmp_path / 'session_stats.json')
+
+
+def make_scheduler(stats_path, needed, **kwargs):
+    return AdaptiveSessionScheduler('tester', needed, stats_path=stats_path, **kwargs)
+
+
+def still_subject(count, jitter, seed=0):
+    """Feature rows of someone sitting still, with hands out of frame"""
+    schema = get_schema()
+    rng = np.random.default_rng(seed)
+    base = rng.random(len(schema.numeric_columns)).astype(np.float32)
+    for name in ('left_hand', 'right_hand'):
+        base[schema.numeric_slices[name]] = 0.0
+    rows = base + rng.normal(0, jitter, (count, len(base))).astype(np.float32)
+    return np.where(base != 0, rows, 0.0)
+
+
+def collect(scheduler, rows, fps=15.0):
+    """Feed accepted rows until the scheduler ends the pass; returns rows used"""
+    for i, row in enumerate(rows):
+        scheduler.record_frame(i / fps, True, row)
+        if scheduler.should_stop_class():
+            return i + 1
+    return len(rows)
+
+
+def test_show_plan_without_measured_rate(stats_path, capsys):
+    scheduler = make_scheduler(stats_path, [('Good_Posture', 200), ('Slouching', 100)])
+    scheduler.next_class()
+    scheduler.record_frame(0.0, False)  # Only a low-quality frame, so no rate yet
+    scheduler.show_plan()
+    assert "~? min" in capsys.readouterr().out
+
+
+def test_save_stats_keeps_other_classes(stats_path):
+    with open(stats_path, 'w') as f:
+        json.dump({'tester': {'Head_Down': {'accepted': 7, 'novel': 5, 'frames': 9, 'active_seconds': 1.0}}}, f)
+
+    scheduler = make_scheduler(stats_path, [('Slouching', 100)])
+    scheduler.next_class()
+    scheduler.record_frame(0.0, True)
+    scheduler.finish_class('Slouching', 1)
+
+    with open(stats_path) as f:
+        stats = json.load(f)['tester']
+    assert stats['Head_Down']['accepted'] == 7
+    assert stats['Slouching']['accepted'] == 1
+
+
+def test_visibility_and_missing_hands_are_not_novelty(stats_path):
+    scheduler = make_scheduler(stats_path, [('Slouching', 100)])
+    schema = get_schema()
+    first = still_subject(1, 0.0)[0]
+    second = first.copy()
+    visibility = [i for i, column in enumerate(schema.numeric_columns) if column.rsplit('_', 1)[-1].startswith('v')]
+    second[visibility] = 0.1
+    second[schema.numeric_slices['left_hand']] = 0.5  # Hand comes into view
+    assert scheduler.landmark_difference(second, first) == 0.0
+
+
+def test_jitter_alone_stops_the_first_pass(stats_path):
+    scheduler = make_scheduler(stats_path, [('Good_Posture', 1000), ('Slouching', 1000)])
+    scheduler.next_class()
+    assert collect(scheduler, still_subject(400, 0.0005)) == scheduler.min_samples
+
+
+def test_movement_is_not_stopped(stats_path):
+    scheduler = make_scheduler(stats_path, [('Good_Posture', 1000), ('Slouching', 1000)])
+    scheduler.next_class()
+    assert collect(scheduler, still_subject(400, 0.01)) == 400
+
+
+def test_pass_targets_leave_room_for_other_classes(stats_path):
+    scheduler = make_scheduler(stats_path, [('Good_Posture', 1000), ('Slouching', 1000)])
+    _, target = scheduler.next_class()
+    assert target == 500  # No rate yet: split over both passes
+
+
+def test_pass_target_follows_measured_rate(stats_path):
+    # 600 frames in 60 s at a 50% pass ratio is 5 accepted samples per second
+    with open(stats_path, 'w') as f:
+        json.dump({'tester': {'Good_Posture': {'accepted': 300, 'novel': 300, 'frames': 600,
+                                               'active_seconds': 60.0}}}, f)
+    scheduler = make_scheduler(stats_path, [('Good_Posture', 1000), ('Slouching', 1000)], pass_minutes=2.0)
+    progress = scheduler.progress['Good_Posture']
+    assert scheduler.pass_target(progress, others_waiting=True) == 600
+    assert scheduler.pass_target(progress, others_waiting=False) == 1000
+
+    progress.passes = 1
+    assert scheduler.pass_target(progress, others_waiting=True) == 1000
+
+
+def test_last_pass_is_never_cut_short(stats_path):
+    scheduler = make_scheduler(stats_path, [('Good_Posture', 1000), ('Slouching', 1000)])
+    rows = still_subject(400, 0.0005)
+    for _ in range(2):
+        name, _ = scheduler.next_class()
+        used = collect(scheduler, rows)
+        scheduler.finish_class(name, used)
+    assert all(p.stopped_early for p in scheduler.progress.values())
+
+    name, target = scheduler.next_class()
+    assert target == scheduler.progress[name].remaining
+    assert collect(scheduler, rows) == len(rows)
+
+
+def test_unfinished_classes_are_reported(stats_path, capsys):
+    scheduler = make_scheduler(stats_path, [('Good_Posture', 300), ('Slouching', 300)], max_passes=1)
+    scheduler.skip_class('Slouching')
+    name, target = scheduler.next_class()
+    assert target == 300
+    scheduler.record_frame(0.0, True)
+    scheduler.finish_class(name, 120)
+    assert scheduler.next_class() is None
+
+    scheduler.summary()
+    out = capsys.readouterr().out
+    assert "WARNING: Good_Posture still needs 180 samples" in out
+    assert "Good_Posture: 180 samples still needed (1 pass(es))" in out
+    assert "Slouching: 300 samples still needed (skipped)" in out